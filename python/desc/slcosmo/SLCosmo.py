@@ -47,6 +47,7 @@ class SLCosmo(object):
         self.lenses = None
         self.lcdatafiles = []
         self.tdc2samplefiles = []
+        self.sample_memory_budget = None
         self.log_likelihoods = None
         self.weights = None
         self.mock_files = []
@@ -131,7 +132,7 @@ class SLCosmo(object):
             self.mock_files.append(filename)
         return
 
-    def read_in_time_delay_samples_from(self, paths):
+    def read_in_time_delay_samples_from(self, paths, lazy=False):
         '''
         Ingest time delay data from a number of TDC2 submission files,
         storing it in a list of `TDC2ensemble` objects, one for each
@@ -141,12 +142,19 @@ class SLCosmo(object):
         -----------
         paths : [list of] string[s[]
             A list of the files to be read from, or a string containing wildcards.
+        lazy : Boolean, optional
+            If True, only scan the file headers, and defer reading the
+            time delay samples until the likelihood needs them.
 
         Notes:
         ------
         Each tdc2samplefile is a multi-column plain text file, with a
         header marked by '#' marks at the start of each line and
         containing a set of Fermat potential information that we need.
+
+        Lazy reading is useful for selecting lenses, or checking a large
+        catalogue, before running the inference. See also
+        `sample_memory_budget`.
         '''
         if type(paths) is str:
             import glob
@@ -157,7 +165,8 @@ class SLCosmo(object):
         self.lenses = [] # trashing any existing data we may have had.
         quad_count = 0
         for tdc2samplefile in tdc2samplefiles:
-            self.lenses.append(desc.slcosmo.TDC2ensemble.read_in_from(tdc2samplefile))
+            self.lenses.append(desc.slcosmo.TDC2ensemble.read_in_from(
+                tdc2samplefile, lazy=lazy))
             if self.lenses[-1].Nim == 4:
                 quad_count += 1
         print("Read in", self.Nlenses, "lenses, quad fraction =",
@@ -197,20 +206,33 @@ class SLCosmo(object):
         The calculation is a sum of log likelihoods over the ensemble
         of lenses, each of which has to first be computed. We also
         compute the importance weights, rescaling and exponentiating.
+
+        If `sample_memory_budget` (in bytes) is set, the time delay
+        samples of the lenses that have been dealt with are released
+        from memory, oldest first, to keep within it. They are read in
+        again from their files if needed later.
         '''
         import time as wallclock
+        from collections import deque
         start = wallclock.time()
         # Compute likelihoods, looping over lenses and summing
         # over samples:
         self.log_likelihoods = np.zeros(self.Npriorsamples)
-        # Loop over sampled values of H0
-        for k in range(self.Npriorsamples):
-            H0 = self.cosmopars['H0'][k]
-            jointlogL = np.array([])
-            for lens in self.lenses:
-                jointlogL = np.append(jointlogL,
-                                      lens.log_likelihood(H0))
-            self.log_likelihoods[k] = np.sum(jointlogL)
+        loaded = deque()
+        loaded_nbytes = 0
+        for lens in self.lenses:
+            # Vectorized over the sampled values of H0:
+            self.log_likelihoods += lens.log_likelihood(self.cosmopars['H0'])
+            # Only lenses with a source file can be released:
+            if self.sample_memory_budget is not None \
+                    and lens.source is not None:
+                loaded.append(lens)
+                loaded_nbytes += lens.samples_nbytes
+                while loaded and \
+                        loaded_nbytes > self.sample_memory_budget:
+                    oldest = loaded.popleft()
+                    loaded_nbytes -= oldest.samples_nbytes
+                    oldest.release_samples()
 
         # Compute normalized importance weights:
         logLmax = np.max(self.log_likelihoods)
@@ -16,6 +16,10 @@ class TDC2ensemble(object):
     This class is a data structure, for storing all the information
     provided in a TDC2 inferred time delay sample file.
 
+    The FP differences are assumed to be independent unless a
+    covariance matrix between the image pairs is provided, as
+    `DeltaFP_cov`. This is not stored in the sample file header.
+
     It could be nice if we moved to using pandas dataframes, so that we
     can refer to the time delays as eg dt['AB'], and the corresponding
     FP differences as DeltaFP['AB'] +/- DeltaFP_err['AB'].
@@ -28,15 +32,50 @@ class TDC2ensemble(object):
 
     3. Write mock samples and header information to a file
 
+    4. Scan a file's header information cheaply, deferring the reading
+    of the samples until they are needed
+
     """
     def __init__(self):
         self.source = None
         self.Nsamples = None
-        self.dt_obs = []
+        self._dt_obs = []
+        self.DeltaFP_cov = None
         return
 
+    @property
+    def dt_obs(self):
+        """
+        The posterior sample time delays, read in from the source file
+        on first access if they are not already in memory.
+        """
+        if self._dt_obs is None:
+            self._read_samples()
+        return self._dt_obs
+
+    @dt_obs.setter
+    def dt_obs(self, value):
+        self._dt_obs = value
+
+    @property
+    def samples_loaded(self):
+        """
+        Whether the posterior sample time delays are held in memory.
+        """
+        return self._dt_obs is not None
+
+    @property
+    def samples_nbytes(self):
+        """
+        The memory occupied by the posterior sample time delays, in
+        bytes (zero if they have not been loaded).
+        """
+        if self._dt_obs is None:
+            return 0
+        return np.asarray(self._dt_obs).nbytes
+
     @staticmethod
-    def read_in_from(tdc2samplefile):
+    def read_in_from(tdc2samplefile, lazy=False):
         """
         Read in both the posterior sample time delays and the Fermat potential header information, and store it for re-use.
 
@@ -44,6 +83,9 @@ class TDC2ensemble(object):
         -----------
         tdc2samplefile : string
                        Name of the file to read from.
+        lazy : Boolean, optional
+             If True, only read the header and count the samples; the
+             time delays are then read in on first access to `dt_obs`.
 
         Returns:
         --------
@@ -63,9 +105,19 @@ class TDC2ensemble(object):
         3. File has no header in it
         4. Samples are not 2D numpy array
         5. Array has wrong number of columns (time delays - should be 1 or 3, and equal to Ndt)
+
+        In lazy mode the number of images is taken from the number of
+        Fermat potential differences in the header, rather than from
+        the shape of the sample array.
         """
         my_object = TDC2ensemble()
         my_object.source = tdc2samplefile
+        if lazy:
+            my_object._read_header(count_samples=True)
+            my_object.Nim = len(my_object.DeltaFP_obs) + 1
+            my_object._dt_obs = None
+            return my_object
+
         my_object._read_header()
         my_object.dt_obs = np.loadtxt(my_object.source)
 
@@ -76,11 +128,43 @@ class TDC2ensemble(object):
         my_object.Nsamples = len(my_object.dt_obs)
         return my_object
 
-    def _read_header(self):
+    def release_samples(self):
+        """
+        Drop the posterior sample time delays from memory, so that they
+        are read in again from the source file on next access.
+
+        Returns:
+        --------
+        released : Boolean
+                 False if there is no source file to re-read the
+                 samples from, in which case they are kept.
+        """
+        if self.source is None:
+            return False
+        self._dt_obs = None
+        return True
+
+    def _read_samples(self):
+        self._dt_obs = np.loadtxt(self.source)
+        self.Nsamples = len(self._dt_obs)
+
+    def _read_header(self, count_samples=False):
         self.DeltaFP_obs = []
         self.DeltaFP_err = []
+        if count_samples:
+            self.Nsamples = 0
         with open(self.source) as input_:
             for line in input_:
+                if not line.startswith('#'):
+                    # End of the header: count the sample rows without
+                    # parsing them, if asked to.
+                    if count_samples:
+                        Nsamples = 1 if line.strip() else 0
+                        for line in input_:
+                            if line.strip():
+                                Nsamples += 1
+                        self.Nsamples = Nsamples
+                    break
                 if line.startswith('# Q'):
                     self.Q = float(line.strip().split(':')[1])
                 if line.startswith('# Delta'):
@@ -118,7 +202,7 @@ class TDC2ensemble(object):
                        header=self.header, comments='# ')
         return
 
-    def log_likelihood(self, H0, fast=True):
+    def log_likelihood(self, H0, batch_size=100):
         """
         Compute the likelihood of the proposed Hubble constant H0 given
         the Fermat potential difference data, marginalizing over the
@@ -126,16 +210,16 @@ class TDC2ensemble(object):
 
         Parameters:
         -----------
-        H0 : float
-             The Hubble constant under evaluation.
-        fast : Boolean, optional
-             Just in case you want to do the calculation
-             without vectorisation.
+        H0 : float, or numpy array of floats
+             The Hubble constant value(s) under evaluation.
+        batch_size : integer, optional
+             The number of H0 values to evaluate at once, limiting the
+             size of the (batch_size x Nsamples) working arrays.
 
         Returns:
         --------
-        logL : float
-              The value of the log likelihood.
+        logL : float, or numpy array of floats
+              The value(s) of the log likelihood, one per H0 value.
 
         See Also:
         ---------
@@ -143,28 +227,52 @@ class TDC2ensemble(object):
 
         Notes:
         ------
-        Don't choose `fast=False`.
+        Each posterior sample is a joint sample of all the time delays
+        in the lens, so the likelihoods of all the image pairs are
+        multiplied together within each sample, before averaging over
+        the samples. The Fermat potential differences are taken to be
+        Gaussian distributed, with covariance `DeltaFP_cov` if it is
+        set, and independent with uncertainties `DeltaFP_err` if not.
+
+        The chi-squared is quadratic in H0, so its coefficients are
+        computed once per sample and then broadcast over H0.
         """
-        if fast:
-            x = self.DeltaFP_obs - (c * self.dt_obs * H0 / self.Q)
-            chisq = (x/self.DeltaFP_err)**2.0
-            logL = -0.5 * chisq \
-                   - np.log(np.sqrt(2*np.pi) * self.DeltaFP_err)
+        H0 = np.asarray(H0, dtype=float)
+        scalar = (H0.ndim == 0)
+        H0 = np.atleast_1d(H0)
+
+        # Make sure doubles have one column of time delays, like quads:
+        dt = np.asarray(self.dt_obs)
+        dt = dt.reshape(len(dt), -1)
+        Nsamples, Ndt = dt.shape
 
+        if self.DeltaFP_cov is None:
+            cov = np.diag(np.asarray(self.DeltaFP_err)**2)
         else:
-            logL = np.array([])
-            Ns = 0
-            for i in range(self.Nsamples):
-                for j in range(self.Nim - 1):
-                    Ns += 1
-                    x = self.DeltaFP_obs[j] - \
-                        (c * self.dt_obs[i,j] * H0 / self.Q)
-                    chisq = (x/self.DeltaFP_err[j])**2.0
-                    logL_el = -0.5 * chisq \
-                        - np.log(np.sqrt(2*np.pi) * self.DeltaFP_err[j])
-                    logL = np.append(logL,logL_el)
-
-        return scipy.misc.logsumexp(logL) - np.log(len(np.ravel(logL)))
+            cov = np.asarray(self.DeltaFP_cov)
+        L = np.linalg.cholesky(cov)
+        Linv = np.linalg.inv(L)
+        lognorm = -0.5 * Ndt * np.log(2*np.pi) \
+                  - np.sum(np.log(np.diag(L)))
+
+        # Whitened residuals are a - H0 * b, for each sample:
+        a = np.dot(Linv, self.DeltaFP_obs)
+        b = np.dot(c * dt / self.Q, Linv.T)
+        aa = np.dot(a, a)
+        ab = np.dot(b, a)
+        bb = np.sum(b**2, axis=1)
+
+        logL = np.empty(len(H0))
+        for start in range(0, len(H0), batch_size):
+            h = H0[start:start+batch_size, np.newaxis]
+            chisq = aa - 2.0 * h * ab + h**2 * bb
+            logL[start:start+batch_size] = \
+                scipy.misc.logsumexp(-0.5 * chisq, axis=1)
+        logL += lognorm - np.log(Nsamples)
+
+        if scalar:
+            return logL[0]
+        return logL
 
     def form_header(self):
         self.header = \
@@ -38,6 +38,33 @@ class SLCosmoUnitTestCase(unittest.TestCase):
             self.assertEqual(self.Lets.lenses[k].Nim,
                              We.lenses[k].Nim)
 
+    def test_lazy_read_in_and_memory_budget(self):
+        self.Lets.make_some_mock_data(8, Nsamples=50, quad_fraction=0.5,
+                                      stem="test_SLCosmo_lazy")
+        We = desc.slcosmo.SLCosmo()
+        We.read_in_time_delay_samples_from(self.Lets.mock_files)
+        They = desc.slcosmo.SLCosmo()
+        They.read_in_time_delay_samples_from(self.Lets.mock_files,
+                                             lazy=True)
+        for k in range(len(They.lenses)):
+            self.assertFalse(They.lenses[k].samples_loaded)
+            self.assertEqual(We.lenses[k].Nim, They.lenses[k].Nim)
+            self.assertEqual(We.lenses[k].Nsamples,
+                             They.lenses[k].Nsamples)
+
+        # Keep no more than one quad lens' worth of samples in memory:
+        They.sample_memory_budget = 50 * 3 * 8
+        We.draw_some_prior_samples(Npriorsamples=50)
+        They.Npriorsamples = We.Npriorsamples
+        They.cosmopars['H0'] = We.cosmopars['H0']
+        We.compute_the_joint_log_likelihood()
+        They.compute_the_joint_log_likelihood()
+        self.assertTrue(np.allclose(We.log_likelihoods,
+                                    They.log_likelihoods))
+        self.assertLessEqual(sum(lens.samples_nbytes
+                                 for lens in They.lenses),
+                             They.sample_memory_budget)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -3,6 +3,32 @@ import numpy as np
 import unittest
 import desc.slcosmo
 
+def reference_log_likelihood(ensemble, H0):
+    """
+    Slow, loop-based version of TDC2ensemble.log_likelihood for a
+    single H0 value, to check the vectorized one against.
+    """
+    dt = np.asarray(ensemble.dt_obs)
+    dt = dt.reshape(len(dt), -1)
+    if ensemble.DeltaFP_cov is None:
+        cov = np.diag(np.asarray(ensemble.DeltaFP_err)**2)
+    else:
+        cov = np.asarray(ensemble.DeltaFP_cov)
+    cov_inv = np.linalg.inv(cov)
+    Ndt = len(ensemble.DeltaFP_obs)
+    logL = []
+    for i in range(len(dt)):
+        # Joint likelihood of all the image pairs in this sample:
+        x = np.array([ensemble.DeltaFP_obs[j] -
+                      desc.slcosmo.TDC2.c * dt[i,j] * H0 / ensemble.Q
+                      for j in range(Ndt)])
+        chisq = np.dot(x, np.dot(cov_inv, x))
+        logL.append(-0.5 * chisq
+                    - 0.5 * np.log((2*np.pi)**Ndt * np.linalg.det(cov)))
+    logL = np.array(logL)
+    logLmax = np.max(logL)
+    return logLmax + np.log(np.mean(np.exp(logL - logLmax)))
+
 class TDC2ensembleTestCase(unittest.TestCase):
     def setUp(self):
         self.two_image_file = os.path.join(os.environ['SLCOSMO_DIR'],
@@ -75,5 +101,85 @@ class TDC2ensembleTestCase(unittest.TestCase):
         self.assertTrue(np.allclose(four_image.dt_obs, temp_image.dt_obs))
         os.remove(four_image_temp_file)
 
+    def test_lazy_read_in_from(self):
+        """
+        Tests that TDC2ensemble.read_in_from in lazy mode gets the same
+        header information and sample count as a full read, and only
+        reads the samples when they are asked for.
+        """
+        for tdc2samplefile in (self.two_image_file, self.four_image_file):
+            full = desc.slcosmo.TDC2ensemble.read_in_from(tdc2samplefile)
+            lazy = desc.slcosmo.TDC2ensemble.read_in_from(tdc2samplefile,
+                                                          lazy=True)
+            self.assertFalse(lazy.samples_loaded)
+            self.assertEqual(lazy.samples_nbytes, 0)
+            self.assertEqual(lazy.source, full.source)
+            self.assertEqual(lazy.Nim, full.Nim)
+            self.assertEqual(lazy.Nsamples, full.Nsamples)
+            self.assertEqual(lazy.Q, full.Q)
+            self.assertTrue(np.array_equal(lazy.DeltaFP_obs,
+                                           full.DeltaFP_obs))
+            self.assertTrue(np.array_equal(lazy.DeltaFP_err,
+                                           full.DeltaFP_err))
+
+            # First access reads the samples in:
+            self.assertTrue(np.array_equal(lazy.dt_obs, full.dt_obs))
+            self.assertTrue(lazy.samples_loaded)
+            self.assertEqual(lazy.samples_nbytes, full.dt_obs.nbytes)
+
+            # Released samples are read in again on next access:
+            self.assertTrue(lazy.release_samples())
+            self.assertFalse(lazy.samples_loaded)
+            self.assertTrue(np.array_equal(lazy.dt_obs, full.dt_obs))
+
+        # Samples with nowhere to be re-read from are kept:
+        mock = desc.slcosmo.TDC2ensemble()
+        mock.dt_obs = np.ones((10, 1))
+        self.assertFalse(mock.release_samples())
+        self.assertTrue(mock.samples_loaded)
+
+    def test_log_likelihood(self):
+        """
+        Tests TDC2ensemble.log_likelihood against the reference
+        implementation, for scalar and batched H0 values.
+        """
+        H0 = np.array([60.0, 65.5, 70.0, 72.3, 80.0])
+        for tdc2samplefile in (self.two_image_file, self.four_image_file):
+            ensemble = desc.slcosmo.TDC2ensemble.read_in_from(tdc2samplefile)
+            expected = np.array([reference_log_likelihood(ensemble, h)
+                                 for h in H0])
+            for k in range(len(H0)):
+                self.assertAlmostEqual(ensemble.log_likelihood(H0[k]),
+                                       expected[k])
+            self.assertTrue(np.allclose(ensemble.log_likelihood(H0),
+                                        expected))
+            self.assertTrue(np.allclose(
+                ensemble.log_likelihood(H0, batch_size=2), expected))
+
+    def test_log_likelihood_with_covariance(self):
+        """
+        Tests TDC2ensemble.log_likelihood with a Fermat potential
+        difference covariance matrix.
+        """
+        H0 = np.array([65.0, 70.0, 75.0])
+        four_image = desc.slcosmo.TDC2ensemble.read_in_from(self.four_image_file)
+        independent = four_image.log_likelihood(H0)
+
+        # A diagonal covariance matrix is the same as no covariance:
+        four_image.DeltaFP_cov = np.diag(four_image.DeltaFP_err**2)
+        self.assertTrue(np.allclose(four_image.log_likelihood(H0),
+                                    independent))
+
+        # Correlated Fermat potential differences:
+        rho = 0.5
+        err = four_image.DeltaFP_err
+        four_image.DeltaFP_cov = rho * np.outer(err, err) + \
+                                 (1.0 - rho) * np.diag(err**2)
+        expected = np.array([reference_log_likelihood(four_image, h)
+                             for h in H0])
+        self.assertTrue(np.allclose(four_image.log_likelihood(H0),
+                                    expected))
+        self.assertFalse(np.allclose(expected, independent))
+
 if __name__ == '__main__':
     unittest.main()